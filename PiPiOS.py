@@ -1,19 +1,178 @@
 from math import e
 import os
+import sys
 import json
 from cryptography.fernet import Fernet
 import threading
 import subprocess
 import tempfile
 import importlib
+import io
+import time
+import datetime
+import heapq
+import itertools
+import random
+import zlib
+import lzma
+import base64
+import functools
+import asyncio
+import inspect
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from multiprocessing.connection import Client
+
+class FileCompressor:
+    #compressed files are stored as "\x00pipi:<algorithm>:<size>\x00<base64 data>" strings
+    #so the tree and filesystem.json keep their shape and files stay plain str values
+    MARKER = "\x00pipi:"
+    ALGORITHMS = {
+        "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+        "lzma": (lzma.compress, lzma.decompress),
+    }
+
+    def __init__(self, algorithm="zlib", threshold=4096, cache_size=8 * 1024 * 1024):
+        self.set_algorithm(algorithm)
+        self.threshold = threshold  #files smaller than this many bytes are stored as is
+        self.cache_size = cache_size  #max characters of decompressed content kept around
+        self.cache = OrderedDict()  #file path -> (stored value, decompressed content), oldest first
+        self.cached_chars = 0
+        self.lock = threading.Lock()  #the cache is used from the shell, log, scheduler and job threads
+        self.hits = 0
+        self.misses = 0
+
+    def set_algorithm(self, algorithm):
+        #choose the algorithm for new writes, existing files keep theirs in their header
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown compression algorithm '{algorithm}'. Use one of: {', '.join(self.ALGORITHMS)}.")
+        self.algorithm = algorithm
+
+    def is_compressed(self, stored):
+        return stored.startswith(self.MARKER)
+
+    def cache_key(self, path):
+        return "\\".join(part for part in path.split("\\") if part)
+
+    def encode(self, content):
+        #return the value to store in the tree for this file content
+        raw = content.encode("utf-8")
+        #content that looks like a compressed value is always compressed so decoding stays unambiguous
+        if len(raw) < self.threshold and not self.is_compressed(content):
+            return content
+        compress = self.ALGORITHMS[self.algorithm][0]
+        data = base64.b64encode(compress(raw)).decode("ascii")
+        if len(data) >= len(raw) and not self.is_compressed(content):
+            return content  #not worth it for incompressible data
+        return f"{self.MARKER}{self.algorithm}:{len(raw)}\x00{data}"
+
+    def decode(self, stored, path=None):
+        #return the file content for a stored value, using the cache for hot files
+        #entries are keyed by path and only used while the path still holds the same stored value
+        if not self.is_compressed(stored):
+            return stored
+        key = self.cache_key(path) if path is not None else None
+        if key is not None:
+            with self.lock:
+                entry = self.cache.get(key)
+                if entry is not None and entry[0] is stored:
+                    self.hits += 1
+                    self.cache.move_to_end(key)
+                    return entry[1]
+                self.misses += 1
+        header, data = stored[len(self.MARKER):].split("\x00", 1)
+        algorithm = header.split(":")[0]
+        decompress = self.ALGORITHMS[algorithm][1]
+        content = decompress(base64.b64decode(data)).decode("utf-8")
+        if key is not None:
+            self.remember(key, stored, content)
+        return content
+
+    def remember(self, key, stored, content):
+        #add to the LRU cache and evict the least recently used entries past the budget
+        if len(content) > self.cache_size:
+            return
+        with self.lock:
+            old = self.cache.pop(key, None)
+            if old is not None:
+                self.cached_chars -= len(old[1])
+            self.cache[key] = (stored, content)
+            self.cached_chars += len(content)
+            while self.cached_chars > self.cache_size:
+                _, (_, evicted) = self.cache.popitem(last=False)
+                self.cached_chars -= len(evicted)
+
+    def invalidate(self, path):
+        #drop a path's cached content when the file is rewritten
+        with self.lock:
+            old = self.cache.pop(self.cache_key(path), None)
+            if old is not None:
+                self.cached_chars -= len(old[1])
+
+    def stored_size(self, stored):
+        #return (original bytes, stored bytes) without decompressing
+        if not self.is_compressed(stored):
+            size = len(stored.encode("utf-8"))
+            return size, size
+        header = stored[len(self.MARKER):stored.index("\x00", len(self.MARKER))]
+        return int(header.split(":")[1]), len(stored)
+
+    def stats(self, file_structure):
+        #walk the tree and report how much the compressed files shrank
+        files = compressed = original = stored_total = 0
+        nodes = [file_structure]
+        while nodes:
+            node = nodes.pop()
+            for value in node.values():
+                if isinstance(value, dict):
+                    nodes.append(value)
+                elif isinstance(value, str):
+                    files += 1
+                    if self.is_compressed(value):
+                        compressed += 1
+                    raw_size, stored_size = self.stored_size(value)
+                    original += raw_size
+                    stored_total += stored_size
+        ratio = original / stored_total if stored_total else 1.0
+        return (
+            f"Files: {files} ({compressed} compressed with {self.algorithm}, threshold {self.threshold} bytes)\n"
+            f"Size: {original} bytes stored as {stored_total} bytes (ratio {ratio:.2f}x)\n"
+            f"Cache: {len(self.cache)} files, {self.hits} hits, {self.misses} misses"
+        )
+
 
 class FileSystem:
     def __init__(self, rootdir="~"):
         self.rootdir = rootdir
         self.file_structure = {}
-        self.current_path = self.rootdir
+        self.compressor = FileCompressor()
+        self.job_state = threading.local()  #per-thread working directory for background jobs
+        self.shell_path = self.rootdir
+        self.lock = threading.RLock()  #background writers like process logs share the tree
         self.load_filesystem()
 
+    @property
+    def current_path(self):
+        #background jobs see the directory they were started in, the shell sees its own
+        return getattr(self.job_state, "path", self.shell_path)
+
+    @current_path.setter
+    def current_path(self, path):
+        if hasattr(self.job_state, "path"):
+            self.job_state.path = path  #a 'cd' inside a job only moves that job
+        else:
+            self.shell_path = path
+
+    @contextlib.contextmanager
+    def working_directory(self, path):
+        #pin current_path for the calling thread while a background job runs
+        self.job_state.path = path
+        try:
+            yield
+        finally:
+            del self.job_state.path
+
     def load_filesystem(self):
         #load filesystem structure from a JSON file if it exists
         if os.path.exists("filesystem.json"):
@@ -39,8 +198,9 @@ class FileSystem:
                 return {key.replace("/", "\\"): convert_paths(value) for key, value in obj.items()}
             return obj
 
-        with open("filesystem.json", "w") as file:
-            json.dump(convert_paths(self.file_structure), file, indent=4)
+        with self.lock:
+            with open("filesystem.json", "w") as file:
+                json.dump(convert_paths(self.file_structure), file, indent=4)
 
     def resolve_path(self, path):
         #resolve absolute and relative paths using backslashes
@@ -108,21 +268,62 @@ class FileSystem:
         #check if the file exists and is a string (file content)
         file_name = path_parts[-1]
         if file_name in node and isinstance(node[file_name], str):
-            return node[file_name]
+            return self.compressor.decode(node[file_name], full_path)
         elif file_name not in node:
             raise FileNotFoundError(f"File '{file_name}' not found in path '{file_path}'.")
         else:
             raise ValueError(f"Path '{file_path}' is not a file.")
 
-    def edit_file(self, file_path, content):
+    def iter_file(self, file_path):
+        #yield a file's content line by line instead of as one string
+        for line in io.StringIO(self.read_file(file_path)):
+            yield line.rstrip("\n")
+
+    def write_stream(self, file_path, chunks, append=False):
+        #write a stream of output chunks into a file, one chunk per line
+        #the stream is fully read before the file is touched, so an error leaves it unchanged
+        #like a shell redirect it prints nothing on success
+        full_path = self.resolve_path(file_path)
+        node = self.file_structure
+        for part in [part for part in full_path.split("\\") if part][:-1]:
+            if part not in node:
+                break  #missing directories are created, like edit_file does
+            node = node[part]
+            if not isinstance(node, dict):
+                raise ValueError(f"Can't write '{file_path}': '{part}' is a file, not a directory.")
+        try:
+            existing = self.read_file(file_path)  #raises ValueError for directories
+        except FileNotFoundError:
+            existing = ""
+        buffer = io.StringIO()
+        if append:
+            buffer.write(existing)
+        for chunk in chunks:
+            buffer.write(chunk)
+            buffer.write("\n")
+        self.edit_file(full_path, buffer.getvalue())
+
+    def get_file(self, full_path):
+        #return the content of a file by its full tree path, or None if it does not exist
+        node = self.file_structure
+        for part in full_path.split("\\"):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return self.compressor.decode(node, full_path) if isinstance(node, str) else None
+
+    def edit_file(self, file_path, content, save=True):
         #edit or create a file
         full_path = file_path.split("\\")  #split by backslash
-        node = self.file_structure
-        for part in full_path[:-1]:
-            if part:
-                node = node.setdefault(part, {})
-        node[full_path[-1]] = content
-        self.save_filesystem()
+        with self.lock:
+            node = self.file_structure
+            for part in full_path[:-1]:
+                if part:
+                    node = node.setdefault(part, {})
+            node[full_path[-1]] = self.compressor.encode(content)
+            self.compressor.invalidate(file_path)
+            if save:
+                self.save_filesystem()
         return f"File '{file_path}' updated successfully."
     
     def nano(self, file_path):
@@ -259,68 +460,193 @@ class UserSystem:
             return "Logged out successfully."
         return "No user is currently logged in."
     
+class ProcessLogger:
+    #streams process stdout/stderr into rotated log files in the virtual filesystem
+    #pipe readers only buffer lines, one shared flusher thread writes them out on a timer
+    def __init__(self, file_system, max_size=64 * 1024, backups=3, flush_size=16 * 1024, flush_interval=1.0, save_interval=5.0):
+        self.fs = file_system
+        self.max_size = max_size  #characters per log file before it is rotated
+        self.backups = backups  #rotated files kept as name.log.1 ... name.log.<backups>
+        self.flush_size = flush_size  #buffered characters that wake the flusher early
+        self.flush_interval = flush_interval  #seconds between writes into the tree
+        self.save_interval = save_interval  #at most one filesystem save per this many seconds
+        self.pending = {}  #log path -> buffered lines not yet written
+        self.pending_size = {}  #log path -> characters in pending
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.flusher = None
+        self.dirty = False  #written into the tree but not saved to disk yet
+        self.last_save = time.monotonic()
+
+    def log_dir(self, username=None):
+        #each user gets their own \var\log, processes started without a user share the root one
+        if username:
+            return f"~\\users\\{username}\\var\\log"
+        return "~\\var\\log"
+
+    def attach(self, process, name, username=None):
+        #start background readers for a process and return its (stdout, stderr) log paths
+        with self.lock:
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self.run_flusher, daemon=True)
+                self.flusher.start()
+        #the pid keeps same-named scripts and concurrent runs of one script in separate logs
+        log_dir = self.log_dir(username)
+        log_name = f"{name}.{process.pid}"
+        paths = (f"{log_dir}\\{log_name}.stdout.log", f"{log_dir}\\{log_name}.stderr.log")
+        for stream, path in zip((process.stdout, process.stderr), paths):
+            thread = threading.Thread(target=self.pump, args=(stream, path), daemon=True)
+            thread.start()
+        return paths
+
+    def pump(self, stream, path):
+        #copy lines from a pipe into the buffer, the flusher writes them out
+        for line in iter(stream.readline, ""):
+            with self.lock:
+                self.pending.setdefault(path, []).append(line)
+                self.pending_size[path] = self.pending_size.get(path, 0) + len(line)
+                full = self.pending_size[path] >= self.flush_size
+            if full:
+                self.wake.set()
+        stream.close()
+        self.wake.set()
+
+    def run_flusher(self):
+        #write every buffered log each flush_interval, and save the image at most every save_interval
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                with self.lock:
+                    paths = list(self.pending)
+                for path in paths:
+                    self.flush(path)
+                if self.dirty and time.monotonic() - self.last_save >= self.save_interval:
+                    self.dirty = False
+                    self.last_save = time.monotonic()
+                    self.fs.save_filesystem()
+            except Exception as e:
+                print(f"Failed to write process logs: {e}")
+
+    def flush(self, path):
+        #append buffered lines to the log in the tree, rotating it first if it would grow too big
+        with self.lock:
+            lines = self.pending.pop(path, None)
+            self.pending_size.pop(path, None)
+        if not lines:
+            return
+        text = "".join(lines)
+        with self.fs.lock:
+            existing = self.fs.get_file(path) or ""
+            if existing and len(existing) + len(text) > self.max_size:
+                self.rotate(path, existing)
+                existing = ""
+            self.fs.edit_file(path, existing + text, save=False)
+            self.dirty = True
+
+    def rotate(self, path, content):
+        #shift name.log.N to name.log.N+1 and drop whatever falls past the retention count
+        parts = path.split("\\")
+        node = self.fs.file_structure
+        for part in parts[:-1]:
+            node = node[part]
+        name = parts[-1]
+        node.pop(f"{name}.{self.backups}", None)
+        for i in range(self.backups - 1, 0, -1):
+            if f"{name}.{i}" in node:
+                node[f"{name}.{i + 1}"] = node.pop(f"{name}.{i}")
+        if self.backups > 0:
+            self.fs.edit_file(f"{path}.1", content, save=False)
+
+    def read(self, path):
+        #flush anything still buffered and return the current log content
+        self.flush(path)
+        return self.fs.get_file(path) or ""
+
+
 class SubprocessManager:
-    def __init__(self):
+    def __init__(self, file_system=None):
         self.processes = {}  #mapping of filename -> process object
+        self.logs = {}  #mapping of filename -> (stdout log path, stderr log path)
         self.lock = threading.Lock()
-        self.fs = FileSystem()
+        self.fs = file_system or FileSystem()
+        self.logger = ProcessLogger(self.fs)
         
     def get_file_content(self, virtual_path, filesystem):
         parts = virtual_path.strip('~').split('\\')
         current = filesystem['~']
         for part in parts:
+            if not part:
+                continue  #leading separator left over from stripping '~'
             if part in current:
                 current = current[part]
             else:
                 raise FileNotFoundError(f"File '{virtual_path}' not found in virtual filesystem.")
         if isinstance(current, str):
-            return current
+            return self.fs.compressor.decode(current, virtual_path)
         else:
             raise FileNotFoundError(f"File '{virtual_path}' not found in virtual filesystem.")
 
-    def start_process(self, virtual_path):
+    def start_process(self, virtual_path, username=None):
         print(f"Starting process for '{virtual_path}'...")
+        try:
+            temp_file_path = self.launch(virtual_path, username)
+            return f"Started process for '{temp_file_path}'. Logging to '{self.logs[temp_file_path][0]}'."
+        except Exception as e:
+            return f"Failed to start process: {str(e)}"
+
+    def launch(self, virtual_path, username=None):
+        #start a virtual Python file and return its process key, raising on failure
         with self.lock:
-            try:
-                #load the virtual filesystem
-                filesystem = self.fs.get_filesystem()
-                if filesystem is None:
-                    raise ValueError("Filesystem could not be loaded.")
-
-                #get the content of the Python file from the virtual filesystem
-                content = self.get_file_content(virtual_path, filesystem)
-
-                #replace \n with actual newline characters
-                formatted_content = content.replace('\\n', '\n')
-
-                #write the formatted content to a temporary Python file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".py") as temp_file:
-                    temp_file.write(formatted_content.encode('utf-8'))
-                    temp_file_path = temp_file.name
-
-                #run the temporary Python script in the background
-                process = subprocess.Popen(
-                    ["python", temp_file_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                self.processes[temp_file_path] = process
-                return f"Started process for '{temp_file_path}'."
-            except Exception as e:
-                return f"Failed to start process: {str(e)}"
+            #load the virtual filesystem
+            filesystem = self.fs.get_filesystem()
+            if filesystem is None:
+                raise ValueError("Filesystem could not be loaded.")
+
+            #get the content of the Python file from the virtual filesystem
+            content = self.get_file_content(virtual_path, filesystem)
+
+            #replace \n with actual newline characters
+            formatted_content = content.replace('\\n', '\n')
+
+            #write the formatted content to a temporary Python file
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".py") as temp_file:
+                temp_file.write(formatted_content.encode('utf-8'))
+                temp_file_path = temp_file.name
+
+            #run the temporary Python script in the background
+            process = subprocess.Popen(
+                ["python", temp_file_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            self.processes[temp_file_path] = process
+            name = virtual_path.split("\\")[-1]
+            self.logs[temp_file_path] = self.logger.attach(process, name, username)
+            return temp_file_path
+
+    def is_running(self, file_path):
+        #check whether a process is still running without touching its output
+        process = self.processes.get(file_path)
+        return process is not None and process.poll() is None
+
+    def forget(self, file_path):
+        #drop a finished process from the table, its logs stay in the filesystem
+        with self.lock:
+            process = self.processes.get(file_path)
+            if process is not None and process.poll() is not None:
+                self.processes.pop(file_path)
+                self.logs.pop(file_path, None)
 
     def read_output(self, file_path):
         with self.lock:
             if file_path not in self.processes:
                 return f"No running process found for '{file_path}'."
+            stdout_log, stderr_log = self.logs[file_path]
 
-            process = self.processes[file_path]
-            try:
-                output, errors = process.communicate(timeout=1)  #non-blocking read
-                return f"Output:\n{output}\nErrors:\n{errors}"
-            except subprocess.TimeoutExpired:
-                return "The process is still running."
+        #the logs are read outside the manager lock
+        return f"Output:\n{self.logger.read(stdout_log)}\nErrors:\n{self.logger.read(stderr_log)}"
 
     def list_processes(self):
         #list all running processes
@@ -336,16 +662,14 @@ class SubprocessManager:
                 return f"No running process found for '{file_path}'."
 
             process = self.processes[file_path]
+            stdout_log, stderr_log = self.logs[file_path]
             if process.poll() is not None:  # Check if process has exited
                 self.processes.pop(file_path)
-                return f"Process '{file_path}' has already terminated."
+                self.logs.pop(file_path)
+                return f"Process '{file_path}' has already terminated. Its output is kept in '{stdout_log}' and '{stderr_log}'."
 
-            #read the output and error streams
-            try:
-                output, errors = process.communicate(timeout=1)  # Non-blocking read
-                return f"Output:\n{output}\nErrors:\n{errors}"
-            except subprocess.TimeoutExpired:
-                return "The process is still running."
+        #read the output and error logs
+        return f"Output:\n{self.logger.read(stdout_log)}\nErrors:\n{self.logger.read(stderr_log)}"
 
     def terminate_process(self, file_path):
         #terminate a specific process
@@ -357,7 +681,288 @@ class SubprocessManager:
             process.terminate()
             process.wait()  # Wait for the process to exit
             self.processes.pop(file_path)
-            return f"Terminated process for '{file_path}'."
+            stdout_log, _ = self.logs.pop(file_path)
+            return f"Terminated process for '{file_path}'. Its output is kept in '{stdout_log}'."
+
+class CronSpec:
+    #a parsed "minute hour day month weekday" schedule, weekday 0 (or 7) is Sunday
+    FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+        "@yearly": "0 0 1 1 *",
+    }
+
+    def __init__(self, spec):
+        self.spec = spec
+        fields = self.ALIASES.get(spec, spec).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron spec '{spec}'. Expected 5 fields: minute hour day month weekday.")
+        values = [self.parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = values
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        #like cron, a restricted day and weekday match when either of them matches
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def parse_field(self, field, low, high):
+        #expand '*', 'a', 'a-b', with an optional '/step', and comma separated lists
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/", 1)
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError(f"Invalid cron field '{field}'. Values must be between {low} and {high}.")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays  #python counts from Monday
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+
+    def next_after(self, moment):
+        #return the first matching minute strictly after moment
+        #mismatching fields skip a whole month/day/hour at a time instead of every minute
+        moment = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        last_year = moment.year + 5
+        while moment.year <= last_year:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            elif not self.day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + datetime.timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += datetime.timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron spec '{self.spec}' never fires.")
+
+
+class Scheduler:
+    #runs virtual scripts on cron schedules from a single thread
+    #jobs sit in a heap ordered by due time, so the thread only wakes when something is due
+    CATCHUP_POLICIES = ("skip", "once")
+
+    def __init__(self, file_system, subprocess_manager, crontab_path="~\\etc\\crontab.json", save_interval=30.0):
+        self.fs = file_system
+        self.manager = subprocess_manager
+        self.crontab_path = crontab_path
+        self.save_interval = save_interval  #last run times are persisted at most this often
+        self.jobs = {}  #name -> job dict as stored in the crontab
+        self.specs = {}  #name -> CronSpec
+        self.tokens = {}  #name -> token of the job's live heap entry, stale entries are skipped
+        self.running = {}  #name -> process key of the job's last run
+        self.skipped = []  #jobs from the crontab whose spec is invalid or never fires
+        self.heap = []  #(due time, token, fire time, name)
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+        self.dirty = False
+        self.last_save = time.time()
+        self.version = 0  #snapshot counter, so a slow write never overwrites a newer crontab
+        self.saved_version = 0
+        self.save_lock = threading.Lock()
+
+    def load(self):
+        #load jobs from the crontab file in the virtual filesystem
+        #an unreadable crontab or a bad job is skipped with a warning, never fatal for boot
+        #skipped jobs are kept in the file so they can be fixed
+        content = self.fs.get_file(self.crontab_path)
+        if not content:
+            return
+        try:
+            jobs = json.loads(content)["jobs"]
+            if not isinstance(jobs, list):
+                raise ValueError("'jobs' is not a list")
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable crontab '{self.crontab_path}': {e}")
+            return
+        for job in jobs:
+            try:
+                if not isinstance(job, dict):
+                    raise ValueError("job is not an object")
+                for key in ("name", "spec", "path"):
+                    if not isinstance(job.get(key), str):
+                        raise ValueError(f"missing or invalid '{key}'")
+                cron_spec = CronSpec(job["spec"])
+                cron_spec.next_after(datetime.datetime.now())
+            except ValueError as e:
+                name = job.get("name") if isinstance(job, dict) else None
+                print(f"Skipping job '{name}': {e}")
+                self.skipped.append(job)
+                continue
+            self.jobs[job["name"]] = job
+            self.specs[job["name"]] = cron_spec
+
+    def save(self):
+        #write the crontab, including last run times for catch-up after downtime
+        self.write(*self.snapshot())
+
+    def snapshot(self):
+        #serialize the crontab, call with the condition held
+        self.dirty = False
+        self.last_save = time.time()
+        self.version += 1
+        return self.version, json.dumps({"jobs": list(self.jobs.values()) + self.skipped}, indent=4)
+
+    def write(self, version, content):
+        #write a snapshot unless a newer one was already written, safe without the condition
+        with self.save_lock:
+            if version <= self.saved_version:
+                return
+            self.saved_version = version
+            self.fs.edit_file(self.crontab_path, content)
+
+    def start(self):
+        #load the crontab, apply each job's catch-up policy and start the dispatch thread
+        with self.condition:
+            self.load()
+            now = time.time()
+            for name, job in self.jobs.items():
+                missed = False
+                if job.get("last_run") is not None:
+                    next_fire = self.specs[name].next_after(datetime.datetime.fromtimestamp(job["last_run"]))
+                    missed = next_fire.timestamp() <= now
+                if missed and job.get("catchup") == "once":
+                    self.push(name, now, now)
+                else:
+                    self.schedule(name, now)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+            if self.dirty:
+                self.save()
+
+    def push(self, name, fire, due):
+        token = next(self.counter)
+        self.tokens[name] = token
+        heapq.heappush(self.heap, (due, token, fire, name))
+
+    def schedule(self, name, after):
+        #queue the job's next run after the given timestamp, delayed by a random jitter
+        fire = self.specs[name].next_after(datetime.datetime.fromtimestamp(after)).timestamp()
+        jitter = self.jobs[name].get("jitter", 0)
+        self.push(name, fire, fire + random.uniform(0, jitter))
+
+    def add_job(self, name, spec, path, username=None, jitter=0, catchup="skip"):
+        if catchup not in self.CATCHUP_POLICIES:
+            raise ValueError(f"Invalid catch-up policy '{catchup}'. Use one of: {', '.join(self.CATCHUP_POLICIES)}.")
+        cron_spec = CronSpec(spec)
+        cron_spec.next_after(datetime.datetime.now())  #rejects specs that never fire before any state changes
+        with self.condition:
+            self.jobs[name] = {
+                "name": name,
+                "spec": spec,
+                "path": path,
+                "user": username,
+                "jitter": jitter,
+                "catchup": catchup,
+                "last_run": None,
+            }
+            self.specs[name] = cron_spec
+            self.schedule(name, time.time())
+            self.save()
+            self.condition.notify()
+        return f"Job '{name}' scheduled for '{spec}'."
+
+    def remove_job(self, name):
+        with self.condition:
+            if name not in self.jobs:
+                return f"No job named '{name}'."
+            del self.jobs[name]
+            del self.specs[name]
+            self.tokens.pop(name, None)  #its heap entry is now stale and will be skipped
+            self.running.pop(name, None)
+            self.save()
+        return f"Job '{name}' removed."
+
+    def list_jobs(self):
+        #yield one line per job, ordered by name
+        with self.condition:
+            jobs = sorted(self.jobs.values(), key=lambda job: job["name"])
+        if not jobs:
+            yield "No jobs are scheduled."
+        for job in jobs:
+            last_run = "never"
+            if job.get("last_run") is not None:
+                last_run = datetime.datetime.fromtimestamp(job["last_run"]).strftime("%Y-%m-%d %H:%M")
+            yield f"{job['name']}: '{job['spec']}' runs {job['path']} (last run: {last_run})"
+
+    def run(self):
+        #due jobs are taken off the heap under the condition, but launched and saved outside it,
+        #so cron_add/cron_list/cron_remove don't wait on a big batch of process starts
+        while True:
+            with self.condition:
+                if self.stopped:
+                    return
+                now = time.time()
+                due = []
+                while self.heap and self.heap[0][0] <= now:
+                    _, token, fire, name = heapq.heappop(self.heap)
+                    if self.tokens.get(name) != token:
+                        continue
+                    due.append((name, fire, dict(self.jobs[name]), self.running.get(name)))
+                    #runs missed while the loop was busy are not replayed
+                    self.schedule(name, max(fire, now))
+                if not due and not (self.dirty and now - self.last_save >= self.save_interval):
+                    timeout = self.save_interval
+                    if self.heap:
+                        timeout = min(timeout, max(self.heap[0][0] - now, 0))
+                    self.condition.wait(timeout)
+                    continue
+
+            started = [(name, fire, self.dispatch(name, job, previous)) for name, fire, job, previous in due]
+
+            with self.condition:
+                for name, fire, process_key in started:
+                    if name not in self.jobs:
+                        continue  #removed while it was being started
+                    if process_key is not None:
+                        self.running[name] = process_key
+                    self.jobs[name]["last_run"] = fire
+                    self.dirty = True
+                snapshot = None
+                if self.dirty and time.time() - self.last_save >= self.save_interval:
+                    snapshot = self.snapshot()
+            if snapshot:
+                self.write(*snapshot)
+
+    def dispatch(self, name, job, previous):
+        #start the job unless its previous run is still going, returns the new process key
+        if previous is not None:
+            if self.manager.is_running(previous):
+                print(f"Skipping job '{name}', its previous run is still going.")
+                return None
+            self.manager.forget(previous)
+        try:
+            return self.manager.launch(job["path"], job.get("user"))
+        except Exception as e:
+            print(f"Failed to start job '{name}': {e}")
+            return None
+
 
 class FileImporter:
     def __init__(self, file_system):
@@ -390,19 +995,180 @@ class FileImporter:
         except Exception as e:
             return f"Error accessing directory '{directory}': {e}"
         
+class ServiceDaemon:
+    #runs a service in its own process (servicehost.py) and talks to it over a local socket
+    #a monitor thread pings it and restarts it with exponential backoff when it dies or hangs
+    def __init__(self, name, timeout=5.0, health_interval=10.0, max_backoff=60.0):
+        self.name = name
+        self.timeout = timeout  #seconds a command call or health check may take
+        self.health_interval = health_interval
+        self.max_backoff = max_backoff
+        self.authkey = os.urandom(16)
+        self.process = None
+        self.address = None
+        self.healthy = False
+        self.restarts = 0
+        self.stopped = False
+        self.wake = threading.Event()  #set to run a health check right away
+        self.monitor = None
+
+    def spawn(self):
+        #start the host process and wait for it to report the port it listens on
+        host_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servicehost.py")
+        self.process = subprocess.Popen(
+            [sys.executable, host_path, self.name],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        #the key goes over stdin, command lines are readable by every local user
+        self.process.stdin.write(self.authkey.hex() + "\n")
+        self.process.stdin.flush()
+        port = []
+        reader = threading.Thread(target=lambda: port.append(self.process.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(self.timeout)
+        if not port or not port[0].strip():
+            self.kill()
+            raise RuntimeError(f"Service '{self.name}' did not report its port, it crashed or took longer than {self.timeout} seconds to start.")
+        self.address = ("127.0.0.1", int(port[0]))
+        self.healthy = True
+
+    def kill(self):
+        self.healthy = False
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def connect(self):
+        #connect and authenticate within the timeout, a stopped daemon would otherwise block forever
+        #Client() has no timeout of its own, so it runs in a helper thread we stop waiting for
+        lock = threading.Lock()
+        done = threading.Event()
+        outcome = {"conn": None, "error": None, "abandoned": False}
+
+        def open_connection():
+            try:
+                conn = Client(self.address, authkey=self.authkey)
+            except Exception as e:
+                outcome["error"] = e
+                done.set()
+                return
+            with lock:
+                if outcome["abandoned"]:
+                    conn.close()  #we already gave up on it
+                    return
+                outcome["conn"] = conn
+            done.set()
+
+        threading.Thread(target=open_connection, daemon=True).start()
+        if not done.wait(self.timeout):
+            with lock:
+                if outcome["conn"] is None:
+                    outcome["abandoned"] = True
+                    raise ConnectionError(f"Service '{self.name}' did not accept a connection within {self.timeout} seconds.")
+        if outcome["error"] is not None:
+            raise outcome["error"]
+        return outcome["conn"]
+
+    def request(self, message):
+        #send one request on its own connection so calls don't wait on each other
+        conn = self.connect()
+        try:
+            conn.send(message)
+            if not conn.poll(self.timeout):
+                raise TimeoutError(f"Service '{self.name}' did not answer within {self.timeout} seconds.")
+            return conn.recv()
+        finally:
+            conn.close()
+
+    def start(self):
+        #start the daemon and return its command_info entries, without functions
+        self.spawn()
+        response = self.request({"op": "describe"})
+        self.monitor = threading.Thread(target=self.supervise, daemon=True)
+        self.monitor.start()
+        return response["result"]
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+        self.kill()
+
+    def check_health(self):
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            return self.request({"op": "ping"})["result"] == "pong"
+        except Exception:
+            return False
+
+    def supervise(self):
+        #health check loop, restarts are spaced out 1, 2, 4, ... up to max_backoff seconds
+        backoff = 1.0
+        while not self.stopped:
+            self.wake.wait(self.health_interval)
+            self.wake.clear()
+            if self.stopped:
+                continue
+            if self.check_health():
+                self.healthy = True  #a failed call may have flagged it, but the daemon is fine
+                continue
+            self.kill()
+            while not self.stopped:
+                print(f"Service '{self.name}' is not responding, restarting in {backoff:.0f}s.")
+                self.wake.wait(backoff)
+                self.wake.clear()
+                if self.stopped:
+                    break
+                try:
+                    self.spawn()
+                    self.restarts += 1
+                    backoff = 1.0
+                    break
+                except Exception:
+                    backoff = min(backoff * 2, self.max_backoff)
+
+    def call(self, command, *args):
+        #run a command in the daemon, this never blocks longer than the timeout
+        if not self.healthy:
+            return f"Service '{self.name}' is not available right now, it is being restarted."
+        try:
+            response = self.request({"op": "call", "command": command, "args": list(args)})
+        except TimeoutError as e:
+            return f"Command '{command}' timed out. {e}"
+        except (OSError, EOFError):  #includes a connection or handshake that timed out
+            self.healthy = False
+            self.wake.set()  #let the monitor restart it
+            return f"Service '{self.name}' stopped responding, it is being restarted."
+        if response["ok"]:
+            return response["result"]
+        if response.get("type") == "TypeError":
+            raise TypeError(response["error"])  #shows the command's syntax like a local command would
+        return response["error"]
+
+    def status(self):
+        state = "running" if self.healthy else "restarting"
+        return f"daemon, {state}, {self.restarts} restarts"
+
+
 class Services:
     def __init__(self, commands):
         self.services = []
+        self.daemons = {}  #service name -> ServiceDaemon for services run out of process
         self.commands = commands
+        commands.services = self
     
     def load_services(self):
         #load services from a json file
         if os.path.exists('services.json'):
             with open('services.json', 'r') as file:
                 data = json.load(file)
-                service_names = [service['name'] for service in data['services']]
-                for service_name in service_names:
-                    self.load_service(service_name)
+                for service in data['services']:
+                    if service.get('daemon'):
+                        self.load_daemon(service)
+                    else:
+                        self.load_service(service['name'])
             print(f"Loaded services: {self.services}")
         else:
             print("No services.json file found.")
@@ -433,15 +1199,134 @@ class Services:
         finally:
             print(f"Current services: {self.services}")
     
+    def load_daemon(self, service):
+        #run the service as a supervised process, its commands are proxied over a socket
+        service_name = service['name']
+        daemon = ServiceDaemon(
+            service_name,
+            timeout=service.get('timeout', 5.0),
+            health_interval=service.get('health_interval', 10.0),
+        )
+        try:
+            command_info = daemon.start()
+        except Exception as e:
+            daemon.stop()
+            print(f"Failed to start daemon for service '{service_name}': {e}")
+            return
+        for cmd, info in command_info.items():
+            info["function"] = functools.partial(daemon.call, cmd)
+            self.commands.command_info[cmd] = info
+        self.daemons[service_name] = daemon
+        self.services.append(service_name)
+        print(f"Service '{service_name}' started as a daemon.")
+
+    def stop_daemons(self):
+        for daemon in self.daemons.values():
+            daemon.stop()
+
     def list_services(self):
-        return "\n".join(self.services)
+        lines = []
+        for service_name in self.services:
+            if service_name in self.daemons:
+                lines.append(f"{service_name} ({self.daemons[service_name].status()})")
+            else:
+                lines.append(service_name)
+        return "\n".join(lines)
+class JobTable:
+    #background jobs for the shell ('cmd &'), run on a small thread pool
+    #coroutine handlers run on one asyncio loop in its own thread
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipios-job")
+        self.jobs = OrderedDict()  #job id -> {"command": command line, "future": Future}
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.loop = None
+
+    def submit(self, command, work):
+        #start work() in the background, it returns the job's output lines
+        with self.lock:
+            job_id = next(self.counter)
+            self.jobs[job_id] = {"command": command, "future": self.executor.submit(work)}
+        return f"[{job_id}] {command}"
+
+    def run_coroutine(self, coroutine):
+        #run a coroutine on the shared event loop and block until it finishes
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def get_id(self, job_id=None):
+        #accept '1' or '%1', default to the most recent job
+        with self.lock:
+            if job_id is None:
+                if not self.jobs:
+                    raise ValueError("No jobs.")
+                return next(reversed(self.jobs))
+            job_id = int(job_id.lstrip("%"))
+            if job_id not in self.jobs:
+                raise ValueError(f"No job with id '{job_id}'.")
+            return job_id
+
+    def state(self, future):
+        if not future.done():
+            return "Running"
+        return "Failed" if future.exception() else "Done"
+
+    def list_jobs(self):
+        with self.lock:
+            jobs = list(self.jobs.items())
+        if not jobs:
+            yield "No jobs."
+        for job_id, job in jobs:
+            yield f"[{job_id}] {self.state(job['future'])}  {job['command']}"
+
+    def finish(self, job_id):
+        #wait for a job, remove it from the table and yield its status line and output
+        job = self.jobs[job_id]
+        try:
+            output = job["future"].result()
+        except Exception as e:
+            output = [str(e)]
+        with self.lock:
+            self.jobs.pop(job_id, None)
+        yield f"[{job_id}] {self.state(job['future'])}  {job['command']}"
+        yield from output
+
+    def collect_finished(self):
+        #yield the results of jobs that completed since the last prompt
+        with self.lock:
+            done = [job_id for job_id, job in self.jobs.items() if job["future"].done()]
+        for job_id in done:
+            yield from self.finish(job_id)
+
+    def wait(self, job_id=None):
+        #wait for one job, or for all of them in the order they were started
+        if job_id is not None:
+            yield from self.finish(self.get_id(job_id))
+            return
+        with self.lock:
+            job_ids = list(self.jobs)
+        for job_id in job_ids:
+            yield from self.finish(job_id)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
 class Commands:
     def __init__(self, file_system, user_system):
         # init the commands with the filesystem and user system
         self.fs = file_system
         self.user_system = user_system
-        self.subprocess_manager = SubprocessManager()
+        self.subprocess_manager = SubprocessManager(file_system)
         self.file_importer = FileImporter(file_system)
+        self.scheduler = Scheduler(file_system, self.subprocess_manager)
+        self.jobs = JobTable()
+        self.services = None  #set by Services once it is created
         self.command_info = {
             "cls": {
                 "description": "Clear the screen.",
@@ -461,7 +1346,7 @@ class Commands:
                 "description": "List contents of the current directory.",
                 "syntax": "ls",
                 "example": "ls",
-                "function": self.list_files(),
+                "function": self.list_files,
                 "category": "files",
             },
             "mkdir": {
@@ -510,7 +1395,7 @@ class Commands:
                 "description": "Read the contents of a file.",
                 "syntax": "read_file <file_path>",
                 "example": "read_file ~/users/admin/Home/Documents/note.txt",
-                "function": self.fs.read_file,
+                "function": self.read_file,
                 "category": "files",
             },
             "subprocess_start": {
@@ -554,6 +1439,7 @@ class Commands:
                 "example": "import_file C:\\path\\to\\file.py ~\\users\\admin\\Home\\Documents\\file.py",
                 "function": self.import_file,
                 "category": "files",
+                "long_running": True,
             },
             "list_real_files": {
                 "description": "List all files in a real directory on the host filesystem.",
@@ -576,6 +1462,81 @@ class Commands:
                 "function": self.list_services,
                 "category": "misc",
             },
+            "cron_add": {
+                "description": "Run a Python file on a cron schedule.",
+                "syntax": "cron_add <name> <file_path> <minute> <hour> <day> <month> <weekday> [jitter_seconds] [skip|once]",
+                "example": "cron_add cleanup cleanup.py */15 * * * * 30 once",
+                "function": self.cron_add,
+                "category": "files",
+            },
+            "cron_remove": {
+                "description": "Remove a scheduled job.",
+                "syntax": "cron_remove <name>",
+                "example": "cron_remove cleanup",
+                "function": self.cron_remove,
+                "category": "files",
+            },
+            "cron_list": {
+                "description": "List all scheduled jobs.",
+                "syntax": "cron_list",
+                "example": "cron_list",
+                "function": self.cron_list,
+                "category": "files",
+            },
+            "compression_stats": {
+                "description": "Show how much file compression is saving.",
+                "syntax": "compression_stats",
+                "example": "compression_stats",
+                "function": self.compression_stats,
+                "category": "files",
+            },
+            "jobs": {
+                "description": "List background jobs.",
+                "syntax": "jobs",
+                "example": "jobs",
+                "function": self.list_jobs,
+                "category": "misc",
+                "foreground_only": True,
+            },
+            "fg": {
+                "description": "Wait for a background job and show its output.",
+                "syntax": "fg [job_id]",
+                "example": "fg 1",
+                "function": self.fg,
+                "category": "misc",
+                "foreground_only": True,
+            },
+            "wait": {
+                "description": "Wait for one or all background jobs to finish.",
+                "syntax": "wait [job_id]",
+                "example": "wait",
+                "function": self.wait,
+                "category": "misc",
+                "foreground_only": True,
+            },
+            "set_compression": {
+                "description": "Choose the compression algorithm for newly written large files.",
+                "syntax": "set_compression <zlib|lzma>",
+                "example": "set_compression lzma",
+                "function": self.set_compression,
+                "category": "files",
+            },
+            "grep": {
+                "description": "Print the piped lines that contain a pattern.",
+                "syntax": "<command> | grep <pattern>",
+                "example": "ls | grep Doc",
+                "function": self.grep,
+                "category": "misc",
+                "stdin": True,
+            },
+            "head": {
+                "description": "Print the first lines of the piped output.",
+                "syntax": "<command> | head [count]",
+                "example": "read_file log.txt | head 5",
+                "function": self.head,
+                "category": "misc",
+                "stdin": True,
+            },
         }
         self.categories = {
             "files",
@@ -584,11 +1545,51 @@ class Commands:
         }
 
     def list_services(self):
-        return os_instance.services.list_services()
+        return self.services.list_services()
 
     def list_files(self):
-        self.fs.list_contents()
-        return "\n".join(self.fs.list_contents())
+        #yield directory entries one at a time so they can be piped
+        for name in self.fs.list_contents():
+            yield name
+
+    def read_file(self, file_path):
+        #stream a file line by line
+        return self.fs.iter_file(file_path)
+
+    def compression_stats(self):
+        #report the compression ratio achieved across the virtual filesystem
+        return self.fs.compressor.stats(self.fs.get_filesystem())
+
+    def set_compression(self, algorithm):
+        self.fs.compressor.set_algorithm(algorithm)
+        return f"New large files will be compressed with {algorithm}."
+
+    def list_jobs(self):
+        return self.jobs.list_jobs()
+
+    def fg(self, job_id=None):
+        return self.jobs.finish(self.jobs.get_id(job_id))
+
+    def wait(self, job_id=None):
+        return self.jobs.wait(job_id)
+
+    def grep(self, pattern, stdin=None):
+        #filter piped lines by a substring pattern
+        if stdin is None:
+            return "grep needs piped input, e.g. 'ls | grep <pattern>'."
+        return (line for line in stdin if pattern in line)
+
+    def head(self, count="10", stdin=None):
+        #pass through the first count piped lines
+        if stdin is None:
+            return "head needs piped input, e.g. 'ls | head 5'."
+        return self.take_lines(stdin, int(count))
+
+    def take_lines(self, stdin, count):
+        for i, line in enumerate(stdin):
+            if i >= count:
+                break
+            yield line
 
     def create_user(self, username, password, admin_mode):
         if username in self.user_system.users:
@@ -628,7 +1629,7 @@ class Commands:
     def subprocess_start(self, file_path):
         #start a subprocess for a Python file
         resolved_path = self.fs.resolve_path(file_path)
-        return self.subprocess_manager.start_process(resolved_path)
+        return self.subprocess_manager.start_process(resolved_path, self.user_system.logged_in_user)
 
     def subprocess_focus(self, file_path):
         #focus on a subprocess for a Python file
@@ -649,6 +1650,18 @@ class Commands:
         resolved_path = self.fs.resolve_path(file_path)
         return self.subprocess_manager.read_output(resolved_path)
     
+    def cron_add(self, name, file_path, minute, hour, day, month, weekday, jitter="0", catchup="skip"):
+        #schedule a Python file, the spec fields are separate arguments since the shell splits on spaces
+        resolved_path = self.fs.resolve_path(file_path)
+        spec = " ".join([minute, hour, day, month, weekday])
+        return self.scheduler.add_job(name, spec, resolved_path, self.user_system.logged_in_user, float(jitter), catchup)
+
+    def cron_remove(self, name):
+        return self.scheduler.remove_job(name)
+
+    def cron_list(self):
+        return self.scheduler.list_jobs()
+
     def import_file(self, source_path, destination_path):
         #imports a py file from the real filesystem to the virtual filesystem
         return self.file_importer.import_file(source_path, destination_path)
@@ -687,18 +1700,113 @@ class Commands:
                 help_text += f" - {cmd}: {info['description']}\n"
         return help_text
 
-    def execute(self, cmd, args):
-        if cmd in self.command_info:
-            func = self.command_info[cmd]["function"]
-            try:
-                return func(*args)
-            except TypeError as e:
-                print(e)
-                return f"Invalid syntax. Correct usage: {self.command_info[cmd]['syntax']}"
-            except Exception as e:
-                return str(e)
-        else:
-            return f"Command '{cmd}' not recognized."
+    def execute(self, cmd, args, stdin=None):
+        try:
+            return self.call(cmd, args, stdin)
+        except Exception as e:
+            return str(e)
+
+    def call(self, cmd, args, stdin=None):
+        #run a command and return its result, raising on errors so pipelines can stop at them
+        if cmd not in self.command_info:
+            raise ValueError(f"Command '{cmd}' not recognized.")
+        func = self.command_info[cmd]["function"]
+        try:
+            if self.command_info[cmd].get("stdin"):
+                #only commands that opt in receive the upstream stream
+                result = func(*args, stdin=stdin)
+            else:
+                result = func(*args)
+        except TypeError as e:
+            print(e)
+            raise ValueError(f"Invalid syntax. Correct usage: {self.command_info[cmd]['syntax']}")
+        if inspect.iscoroutine(result):
+            result = self.jobs.run_coroutine(result)
+        return result
+
+    def iter_output(self, result):
+        #turn whatever a handler returned into a stream of output lines
+        #strings are split into lines so grep/head see them like streamed output
+        if result is None:
+            return
+        if isinstance(result, str):
+            yield from result.splitlines()
+            return
+        if not hasattr(result, "__iter__"):
+            yield str(result)
+            return
+        #errors raised while a generator runs are left to propagate to run_pipeline
+        for chunk in result:
+            yield str(chunk)
+
+    def guard_stream(self, stream):
+        #stop at the first error in any stage and report it as the last line of output
+        try:
+            yield from stream
+        except Exception as e:
+            yield str(e)
+
+    def parse_pipeline(self, cmd_input):
+        #split a command line into (cmd, args) stages, an optional (operator, target) redirect
+        #and whether it ends with '&' to run in the background
+        tokens = cmd_input.split()
+        background = bool(tokens) and tokens[-1] == "&"
+        if background:
+            tokens = tokens[:-1]
+        redirect = None
+        for i, token in enumerate(tokens):
+            if token in (">", ">>"):
+                if len(tokens) != i + 2:
+                    raise ValueError(f"Invalid redirect. Correct usage: <command> {token} <file_path>")
+                redirect = (token, tokens[i + 1])
+                tokens = tokens[:i]
+                break
+
+        stages = [[]]
+        for token in tokens:
+            if token == "|":
+                stages.append([])
+            else:
+                stages[-1].append(token)
+        if any(not stage for stage in stages):
+            raise ValueError("Invalid pipeline. Correct usage: <command> | <command>")
+        return [(stage[0], stage[1:]) for stage in stages], redirect, background
+
+    def run_pipeline(self, cmd_input):
+        #run 'a | b | c > file' and return the resulting output stream
+        #'&' or a long-running command sends the whole line to the job table instead
+        try:
+            stages, redirect, background = self.parse_pipeline(cmd_input)
+            long_running = any(self.command_info.get(cmd, {}).get("long_running") for cmd, _ in stages)
+            if background or long_running:
+                #a job waiting on the job table would wait on itself and never finish
+                for cmd, _ in stages:
+                    if self.command_info.get(cmd, {}).get("foreground_only"):
+                        raise ValueError(f"'{cmd}' can't run in the background.")
+                command = " ".join(cmd_input.split()[:-1] if background else cmd_input.split())
+                #relative paths resolve against the directory the job was started in,
+                #not wherever the shell has moved to by the time a worker picks it up
+                path = self.fs.current_path
+
+                def work():
+                    with self.fs.working_directory(path):
+                        return list(self.stream_stages(stages, redirect))
+
+                return iter([self.jobs.submit(command, work)])
+            return self.guard_stream(self.stream_stages(stages, redirect))
+        except Exception as e:
+            return iter([str(e)])
+
+    def stream_stages(self, stages, redirect):
+        #each stage reads the previous stage's stream lazily, nothing is joined in between
+        #errors propagate out of here, so a failing stage never reaches a redirect target
+        stream = None
+        for cmd, args in stages:
+            stream = self.iter_output(self.call(cmd, args, stdin=stream))
+        if redirect:
+            operator, target = redirect
+            return self.iter_output(self.fs.write_stream(target, stream, append=operator == ">>"))
+        return stream
 
 
 class PythonOS:
@@ -709,6 +1817,7 @@ class PythonOS:
         self.services = Services(self.commands)
         self.services.load_services()
         print(self.services.list_services())
+        self.commands.scheduler.start()
 
         #automatically create the admin user if not already present
         if "admin" not in self.us.users:
@@ -741,6 +1850,9 @@ class PythonOS:
     def main(self):
         while True:
             if self.us.logged_in_user:
+                #report background jobs that finished since the last prompt
+                for line in self.commands.jobs.collect_finished():
+                    print(line)
                 cmd_input = input(f"{self.fs.current_path} > ").strip()
                 if cmd_input == "exit":
                     self.shutdown()
@@ -749,10 +1861,12 @@ class PythonOS:
                     self.shutdown()
                     break
 
-                parts = cmd_input.split()
-                cmd = parts[0]
-                args = parts[1:]
-                print(self.commands.execute(cmd, args))
+                if not cmd_input:
+                    continue
+
+                #print output as it is produced instead of waiting for the whole result
+                for chunk in self.commands.run_pipeline(cmd_input):
+                    print(chunk)
             else:
                 #os.system("cls" if os.name == "nt" else "clear")
                 self.show_login_screen()
@@ -760,19 +1874,25 @@ class PythonOS:
     def shutdown(self):
         print("Shutting down PiPiOS...")
         print(self.us.logout())
+        self.commands.scheduler.stop()
+        self.services.stop_daemons()
+        self.commands.jobs.shutdown()
         print(self.fs.save_filesystem())
         print("PiPiOS has been shut down.")
 
 
-#start the OS
-
-try:
-    os_instance = PythonOS()
-    os_instance.boot()
-    os_instance.main()
-except KeyboardInterrupt:
-    print("\nKeyboardInterrupt:")
-    os_instance.shutdown()
-except Exception as e:
-    print(f"An error occurred: {str(e)}")
-    os_instance.shutdown()
+#start the OS, importing this module (e.g. from loadgen.py) only defines the classes
+if __name__ == "__main__":
+    os_instance = None
+    try:
+        os_instance = PythonOS()
+        os_instance.boot()
+        os_instance.main()
+    except KeyboardInterrupt:
+        print("\nKeyboardInterrupt:")
+        if os_instance is not None:
+            os_instance.shutdown()
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        if os_instance is not None:
+            os_instance.shutdown()
@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import tempfile
+import threading
+import contextlib
+import io
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+#replays recorded shell traffic against an in-process PiPiOS and reports throughput,
+#latency percentiles and whether the filesystem ended up in the expected state
+#
+#the log is JSONL, one command per line, replayed in order within each session:
+#   {"session": "alice", "command": "login admin admin123"}
+#   {"session": "alice", "command": "mkdir notes"}
+#   {"session": "alice", "command": "nano notes\\todo.txt", "content": "buy milk\n"}
+#   {"session": "alice", "command": "read_file notes\\todo.txt"}
+#   {"session": "alice", "command": "subprocess_start notes\\job.py"}
+#nano lines carry the text that would have been typed (nano lines without it are counted as errors),
+#everything else runs through the shell
+#
+#usage: python loadgen.py [log.jsonl] [--sessions N] [--events N] [--miss-rate F] [--write-log PATH] [--workdir DIR]
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ERROR_MARKERS = ("not recognized", "Invalid", "not found", "Failed", "does not exist")
+
+
+def load_log(path):
+    #group log lines by session, keeping their order
+    sessions = defaultdict(list)
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                event = json.loads(line)
+                sessions[event.get("session", "default")].append(event)
+    return dict(sessions)
+
+
+def generate_log(session_count, events_per_session, seed=0, miss_rate=0.0):
+    #build a synthetic workload: every session gets its own user and works in its own home
+    #reads only target files the session already wrote, except for a miss_rate share of
+    #reads that deliberately ask for a missing file to exercise the error path
+    rng = random.Random(seed)
+    sessions = {}
+    for i in range(session_count):
+        name = f"user{i}"
+        events = [
+            {"command": "login admin admin123"},
+            {"command": f"create_user {name} pass{i} false"},
+            {"command": "logout"},
+            {"command": f"login {name} pass{i}"},
+            {"command": "mkdir work"},
+            {"command": "nano work\\job.py", "content": f"print('hello from {name}')\n"},
+        ]
+        written = []
+        for j in range(events_per_session):
+            roll = rng.random()
+            if roll < 0.3 or (roll < 0.6 and not written):
+                content = "".join(f"{name} line {j}.{k}\n" for k in range(rng.randint(1, 400)))
+                events.append({"command": f"nano work\\file{j % 10}.txt", "content": content})
+                if j % 10 not in written:
+                    written.append(j % 10)
+            elif roll < 0.6:
+                if rng.random() < miss_rate:
+                    events.append({"command": "read_file work\\missing.txt | head 5"})
+                else:
+                    events.append({"command": f"read_file work\\file{rng.choice(written)}.txt | head 5"})
+            elif roll < 0.75:
+                events.append({"command": "ls"})
+            elif roll < 0.85:
+                events.append({"command": f"mkdir dir{j}"})
+            elif roll < 0.95:
+                events.append({"command": "cd work"})
+                events.append({"command": "ls | grep file"})
+                events.append({"command": f"cd ~/users/{name}/Home"})
+            else:
+                events.append({"command": "subprocess_start work\\job.py"})
+        events.append({"command": "logout"})
+        for event in events:
+            event["session"] = name
+        sessions[name] = events
+    return sessions
+
+
+def percentile(values, pct):
+    #nearest-rank percentile of an already sorted list
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Session:
+    #the state PiPiOS keeps per login, swapped in and out around each command
+    def __init__(self, name, events):
+        self.name = name
+        self.events = events
+        self.current_path = "~"
+        self.logged_in_user = None
+
+
+class LoadGenerator:
+    def __init__(self, os_instance, sessions):
+        self.os = os_instance
+        self.sessions = [Session(name, events) for name, events in sessions.items()]
+        #PythonOS has one current directory and one logged in user, so commands from
+        #different sessions are interleaved one at a time around this lock
+        self.shell_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.latencies = defaultdict(list)  #command name -> seconds including waiting for the shell
+        self.service_times = defaultdict(list)  #command name -> seconds spent running
+        self.errors = defaultdict(int)
+        self.expected_files = {}  #full path -> content of the last nano write
+        self.expected_dirs = set()
+
+    def run_command(self, session, event):
+        command = event["command"]
+        name = command.split()[0] if command.split() else ""
+        queued = time.perf_counter()
+        with self.shell_lock:
+            started = time.perf_counter()
+            fs = self.os.fs
+            fs.current_path = session.current_path
+            self.os.us.logged_in_user = session.logged_in_user
+            try:
+                if name == "nano" and "content" not in event:
+                    #nano would sit waiting on stdin, count it as a bad log line instead
+                    output = ["Invalid log line: nano needs the typed text in 'content'."]
+                elif name == "nano":
+                    #nano reads stdin, so write what the user typed the same way nano saves it
+                    full_path = fs.resolve_path(command.split()[1])
+                    fs.edit_file(full_path, event["content"])
+                    self.expected_files[full_path] = event["content"]
+                    output = []
+                else:
+                    if name == "mkdir" and len(command.split()) == 2:
+                        self.expected_dirs.add(f"{fs.current_path}\\{command.split()[1]}")
+                    output = list(self.os.commands.run_pipeline(command))
+            except Exception as e:
+                output = [str(e)]
+            session.current_path = fs.current_path
+            session.logged_in_user = self.os.us.logged_in_user
+            finished = time.perf_counter()
+        with self.stats_lock:
+            self.latencies[name].append(finished - queued)
+            self.service_times[name].append(finished - started)
+            if any(marker in line for line in output for marker in ERROR_MARKERS):
+                self.errors[name] += 1
+
+    def replay(self, session):
+        for event in session.events:
+            self.run_command(session, event)
+
+    def run(self, concurrency):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(self.replay, session) for session in self.sessions]:
+                future.result()
+        elapsed = time.perf_counter() - started
+        return elapsed
+
+    def settle(self, timeout=30.0):
+        #let background jobs and started processes finish before checking state
+        list(self.os.commands.jobs.wait())
+        manager = self.os.commands.subprocess_manager
+        deadline = time.time() + timeout
+        for process in list(manager.processes.values()):
+            try:
+                process.wait(max(0.0, deadline - time.time()))
+            except Exception:
+                pass
+        return manager
+
+    def check_consistency(self):
+        #compare the live tree and the saved image with what the replay wrote
+        from PiPiOS import FileSystem
+        problems = []
+        fs = self.os.fs
+        for path, content in self.expected_files.items():
+            if fs.get_file(path) != content:
+                problems.append(f"File '{path}' does not hold its last written content.")
+        for path in self.expected_dirs:
+            node = fs.file_structure
+            for part in path.split("\\"):
+                node = node.get(part) if isinstance(node, dict) else None
+            if not isinstance(node, dict):
+                problems.append(f"Directory '{path}' is missing.")
+
+        manager = self.settle()
+        for stdout_log, stderr_log in list(manager.logs.values()):
+            manager.logger.read(stdout_log)
+            manager.logger.read(stderr_log)
+
+        with fs.lock:
+            fs.save_filesystem()
+            saved = json.loads(json.dumps(fs.file_structure))
+        reloaded = FileSystem()
+        if saved != reloaded.file_structure:
+            problems.append("filesystem.json does not match the in-memory filesystem.")
+        for path, content in self.expected_files.items():
+            if reloaded.get_file(path) != content:
+                problems.append(f"File '{path}' did not survive a save and reload.")
+        return problems
+
+    def report(self, elapsed, problems):
+        lines = []
+        total = sum(len(values) for values in self.latencies.values())
+        lines.append(f"Sessions: {len(self.sessions)}  Commands: {total}  Time: {elapsed:.2f}s  Throughput: {total / elapsed:.1f} cmd/s")
+        lines.append("")
+        lines.append(f"{'command':<18}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'run p50':>10}")
+        everything = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            service = sorted(self.service_times[name])
+            everything.extend(values)
+            lines.append(
+                f"{name:<18}{len(values):>7}{self.errors[name]:>8}"
+                f"{percentile(values, 50) * 1000:>10.2f}{percentile(values, 90) * 1000:>10.2f}"
+                f"{percentile(values, 99) * 1000:>10.2f}{values[-1] * 1000:>10.2f}{percentile(service, 50) * 1000:>10.2f}"
+            )
+        everything.sort()
+        lines.append(
+            f"{'all':<18}{len(everything):>7}{sum(self.errors.values()):>8}"
+            f"{percentile(everything, 50) * 1000:>10.2f}{percentile(everything, 90) * 1000:>10.2f}"
+            f"{percentile(everything, 99) * 1000:>10.2f}{(everything[-1] if everything else 0) * 1000:>10.2f}"
+        )
+        lines.append("")
+        lines.append("Latency includes waiting for the shell, 'run p50' is the time spent running the command.")
+        lines.append(f"Consistency: {len(self.expected_files)} files and {len(self.expected_dirs)} directories checked.")
+        if problems:
+            lines.extend(f" - {problem}" for problem in problems)
+        else:
+            lines.append("Consistency: OK")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay shell traffic against an in-process PiPiOS.")
+    parser.add_argument("log", nargs="?", help="JSONL log to replay, a synthetic workload is used if omitted")
+    parser.add_argument("--sessions", type=int, default=8, help="sessions replayed at the same time (and generated, for synthetic workloads)")
+    parser.add_argument("--events", type=int, default=50, help="commands per generated session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--miss-rate", type=float, default=0.0, help="share of generated reads that ask for a missing file")
+    parser.add_argument("--write-log", help="save the generated workload as JSONL for later replays")
+    parser.add_argument("--workdir", help="directory for filesystem.json and the other state files, a temporary one by default")
+    args = parser.parse_args()
+
+    if args.log:
+        sessions = load_log(args.log)
+    else:
+        sessions = generate_log(args.sessions, args.events, args.seed, args.miss_rate)
+    if args.write_log:
+        with open(args.write_log, "w") as file:
+            for events in sessions.values():
+                for event in events:
+                    file.write(json.dumps(event) + "\n")
+
+    #PiPiOS keeps its state in the working directory, never touch the real one
+    workdir = args.workdir or tempfile.mkdtemp(prefix="pipios-load-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+
+    from PiPiOS import PythonOS
+    with contextlib.redirect_stdout(io.StringIO()):
+        os_instance = PythonOS()
+        generator = LoadGenerator(os_instance, sessions)
+        elapsed = generator.run(args.sessions)
+        problems = generator.check_consistency()
+        os_instance.shutdown()
+    print(generator.report(elapsed, problems))
+    print(f"State files are in {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import importlib
+import threading
+from multiprocessing.connection import Listener, deliver_challenge, answer_challenge
+
+#runs a single service in its own process for PiPiOS
+#usage: python servicehost.py <service_name>, with the hex authkey as the first line of stdin
+#stdout only ever carries the port it listens on, anything the service prints goes to stderr
+
+class CommandTable:
+    #stands in for PiPiOS's Commands so a service's register() can fill command_info
+    def __init__(self):
+        self.command_info = {}
+
+def dispatch(request, commands):
+    #answer a single request from the shell
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "result": "pong"}
+    if op == "describe":
+        #functions stay here, the shell only needs the help info
+        described = {}
+        for name, info in commands.command_info.items():
+            described[name] = {key: value for key, value in info.items() if key != "function"}
+        return {"ok": True, "result": described}
+    if op == "call":
+        info = commands.command_info.get(request["command"])
+        if info is None:
+            return {"ok": False, "error": f"Command '{request['command']}' not recognized."}
+        try:
+            result = info["function"](*request["args"])
+            #generators can't be sent over the connection, send their lines instead
+            if result is not None and not isinstance(result, str) and hasattr(result, "__iter__"):
+                result = [str(line) for line in result]
+            return {"ok": True, "result": result}
+        except Exception as e:
+            return {"ok": False, "error": str(e), "type": type(e).__name__}
+    return {"ok": False, "error": f"Unknown operation '{op}'."}
+
+def handle(conn, commands, authkey):
+    #serve one connection, each connection gets its own thread so calls run concurrently
+    #the handshake happens here too, so a client that stalls in it only holds up itself
+    try:
+        try:
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+        except Exception:
+            return  #failed handshakes don't take the service down
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            response = dispatch(request, commands)
+            try:
+                conn.send(response)
+            except (OSError, EOFError):
+                break  #the shell went away
+            except Exception as e:
+                #e.g. a result that can't be pickled, report it instead of dropping the connection
+                conn.send({"ok": False, "error": f"Command returned a result that can't be sent: {e}"})
+    finally:
+        conn.close()
+
+def watch_parent():
+    #the shell keeps our stdin open, exit as soon as it goes away
+    sys.stdin.read()
+    os._exit(0)
+
+def main():
+    service_name = sys.argv[1]
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+
+    #keep the real stdout for the port, so prints while loading or serving can't be mistaken for it
+    port_channel = sys.stdout
+    sys.stdout = sys.stderr
+
+    module = importlib.import_module(service_name)
+    commands = CommandTable()
+    module.register(commands)
+
+    #no authkey here, Listener would authenticate on the accept thread
+    listener = Listener(("127.0.0.1", 0), backlog=64)
+    threading.Thread(target=watch_parent, daemon=True).start()
+    port_channel.write(f"{listener.address[1]}\n")
+    port_channel.flush()
+
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError:
+            continue
+        threading.Thread(target=handle, args=(conn, commands, authkey), daemon=True).start()
+
+if __name__ == "__main__":
+    main()